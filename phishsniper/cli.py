@@ -2,20 +2,40 @@
 Command Line Interface for PhishSniper.
 """
 
+import io
+import os
 import sys
 import json
+import asyncio
 import logging
 import argparse
-from typing import List, Optional
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional
 
 import colorama
+import orjson
 from colorama import Fore, Style
 
 from .phishsniper import PhishSniper
 from .result import AnalysisResult
+from .modules.domain_intelligence import DEFAULT_WHOIS_CACHE_FILE, MAX_CONCURRENT_LOOKUPS
 
-# Initialize colorama
-colorama.init(autoreset=True)
+
+class _NoColor:
+    """Stand-in for colorama's Fore and Style that yields empty codes."""
+
+    def __getattr__(self, name: str) -> str:
+        return ""
+
+
+# Only colorize (and let colorama wrap stdout) when writing to a terminal
+_IS_TTY = sys.stdout.isatty()
+if _IS_TTY:
+    colorama.init(autoreset=True)
+    _FORE, _STYLE = Fore, Style
+else:
+    _FORE = _STYLE = _NoColor()
 
 # Set up logging
 logging.basicConfig(
@@ -25,6 +45,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PhishSniper instance owned by a batch worker process
+_WORKER_PS: Optional[PhishSniper] = None
+
+# Number of batch results printed per write when stdout is not a terminal
+PRINT_BATCH_SIZE = 64
+
 
 def setup_parser() -> argparse.ArgumentParser:
     """
@@ -58,7 +84,13 @@ def setup_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--output", "-o",
         type=str,
-        help="Output file for results (JSON format)"
+        help="Output file for results (JSON Lines format, written as results complete)"
+    )
+    
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write the output file as one indented JSON array instead of JSON Lines"
     )
     
     parser.add_argument(
@@ -73,6 +105,25 @@ def setup_parser() -> argparse.ArgumentParser:
         help="Path to JSON file containing brand names"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Disable the persistent WHOIS cache (default: {DEFAULT_WHOIS_CACHE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Number of parallel workers for file analysis, or of concurrent lookups "
+             f"with --io-bound (default: CPU count, or {MAX_CONCURRENT_LOOKUPS} with --io-bound)"
+    )
+    
+    parser.add_argument(
+        "--io-bound",
+        action="store_true",
+        help="Run WHOIS lookups concurrently on an asyncio event loop instead of using processes"
+    )
+    
     return parser
 
 
@@ -95,7 +146,56 @@ def analyze_url(url: str, phish_sniper: PhishSniper, verbose: bool = False) -> A
         raise
 
 
-def analyze_urls_from_file(file_path: str, phish_sniper: PhishSniper, verbose: bool = False) -> List[AnalysisResult]:
+def _safe_analyze(url: str, phish_sniper: PhishSniper, verbose: bool = False) -> Optional[AnalysisResult]:
+    """
+    Analyze a URL, logging instead of raising on failure.
+
+    Args:
+        url (str): URL to analyze
+        phish_sniper (PhishSniper): PhishSniper instance
+        verbose (bool, optional): Enable verbose output. Defaults to False.
+
+    Returns:
+        Optional[AnalysisResult]: Analysis result, or None if the analysis failed
+    """
+    try:
+        return phish_sniper.analyze(url, verbose)
+    except Exception as e:
+        logger.error(f"Error analyzing URL {url}: {str(e)}")
+        return None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """
+    Build the PhishSniper instance of a batch worker process.
+
+    Runs once per worker as the process pool initializer, so the module
+    setup cost is paid at worker startup rather than per URL.
+
+    Args:
+        config (Dict[str, Any]): PhishSniper configuration
+    """
+    global _WORKER_PS
+    _WORKER_PS = PhishSniper(config)
+
+
+def _analyze_one(url: str, verbose: bool = False) -> Optional[AnalysisResult]:
+    """
+    Analyze a single URL inside a batch worker process.
+
+    Args:
+        url (str): URL to analyze
+        verbose (bool, optional): Enable verbose output. Defaults to False.
+
+    Returns:
+        Optional[AnalysisResult]: Analysis result, or None if the analysis failed
+    """
+    return _safe_analyze(url, _WORKER_PS, verbose)
+
+
+def analyze_urls_from_file(file_path: str, phish_sniper: PhishSniper, verbose: bool = False,
+                           workers: int = 1, io_bound: bool = False,
+                           output: Optional[BinaryIO] = None) -> List[AnalysisResult]:
     """
     Analyze URLs from a file.
 
@@ -103,6 +203,12 @@ def analyze_urls_from_file(file_path: str, phish_sniper: PhishSniper, verbose: b
         file_path (str): Path to file containing URLs
         phish_sniper (PhishSniper): PhishSniper instance
         verbose (bool, optional): Enable verbose output. Defaults to False.
+        workers (int, optional): Number of parallel workers, or of concurrent lookups
+                                 when io_bound is set. Defaults to 1 (serial).
+        io_bound (bool, optional): Run the analyses concurrently on an asyncio event
+                                   loop instead of a process pool. Defaults to False.
+        output (BinaryIO, optional): Binary stream to write each result to as a JSON
+                                     line as soon as it is collected. Defaults to None.
 
     Returns:
         List[AnalysisResult]: List of analysis results
@@ -112,21 +218,77 @@ def analyze_urls_from_file(file_path: str, phish_sniper: PhishSniper, verbose: b
     try:
         with open(file_path, 'r') as f:
             urls = [line.strip() for line in f if line.strip()]
-            
-        for url in urls:
-            try:
-                result = phish_sniper.analyze(url, verbose)
-                results.append(result)
-                print_result(result, verbose)
-            except Exception as e:
-                logger.error(f"Error analyzing URL {url}: {str(e)}")
-                
     except Exception as e:
         logger.error(f"Error reading file {file_path}: {str(e)}")
+        return results
+        
+    if workers <= 1 or len(urls) <= 1:
+        outcomes = (_safe_analyze(url, phish_sniper, verbose) for url in urls)
+        _collect_results(outcomes, results, verbose, output)
+    elif io_bound:
+        outcomes = asyncio.run(phish_sniper.analyze_many_async(urls, verbose, workers))
+        _collect_results(_log_failures(urls, outcomes), results, verbose, output)
+    else:
+        # Every worker builds its own PhishSniper, so never start more than there are URLs
+        workers = min(workers, len(urls))
+        chunksize = max(1, min(16, len(urls) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(phish_sniper.config,)) as executor:
+            outcomes = executor.map(_analyze_one, urls, [verbose] * len(urls), chunksize=chunksize)
+            _collect_results(outcomes, results, verbose, output)
         
     return results
 
 
+def _log_failures(urls: List[str], outcomes: List[Any]) -> List[Optional[AnalysisResult]]:
+    """
+    Log the URLs of a batch whose analysis raised, replacing their outcomes with None.
+
+    Args:
+        urls (List[str]): URLs of the batch
+        outcomes (List[Any]): An AnalysisResult or the raised exception for each URL
+
+    Returns:
+        List[Optional[AnalysisResult]]: Results in input order, None for failed URLs
+    """
+    results = []
+    for url, outcome in zip(urls, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error analyzing URL {url}: {str(outcome)}")
+            outcome = None
+        results.append(outcome)
+    return results
+
+
+def _collect_results(outcomes, results: List[AnalysisResult], verbose: bool = False,
+                     output: Optional[BinaryIO] = None) -> None:
+    """
+    Print and collect batch outcomes in input order, skipping failed URLs.
+
+    Args:
+        outcomes: Iterable of Optional[AnalysisResult]
+        results (List[AnalysisResult]): List to append successful results to
+        verbose (bool, optional): Enable verbose output. Defaults to False.
+        output (BinaryIO, optional): Binary stream to write each result to. Defaults to None.
+    """
+    # Terminals get each result immediately; pipes and files get them in batches
+    batch_size = 1 if _IS_TTY else PRINT_BATCH_SIZE
+    pending = []
+    
+    for result in outcomes:
+        if result is not None:
+            results.append(result)
+            pending.append(format_result(result, verbose))
+            if len(pending) >= batch_size:
+                sys.stdout.write("".join(pending))
+                pending.clear()
+            if output is not None:
+                write_result(result, output)
+                
+    if pending:
+        sys.stdout.write("".join(pending))
+
+
 def print_result(result: AnalysisResult, verbose: bool = False) -> None:
     """
     Print analysis result to console.
@@ -135,62 +297,99 @@ def print_result(result: AnalysisResult, verbose: bool = False) -> None:
         result (AnalysisResult): Analysis result
         verbose (bool, optional): Enable verbose output. Defaults to False.
     """
+    sys.stdout.write(format_result(result, verbose))
+
+
+def format_result(result: AnalysisResult, verbose: bool = False) -> str:
+    """
+    Format an analysis result for console output.
+
+    Args:
+        result (AnalysisResult): Analysis result
+        verbose (bool, optional): Enable verbose output. Defaults to False.
+
+    Returns:
+        str: Formatted result, built in one buffer so it is written at once
+    """
+    buf = io.StringIO()
+    
     # Determine color based on risk level
     if result.risk_level == "High":
-        risk_color = Fore.RED
+        risk_color = _FORE.RED
     elif result.risk_level == "Medium":
-        risk_color = Fore.YELLOW
+        risk_color = _FORE.YELLOW
     else:
-        risk_color = Fore.GREEN
+        risk_color = _FORE.GREEN
         
-    print("\n" + "="*80)
-    print(f"URL: {Style.BRIGHT}{result.url}{Style.RESET_ALL}")
-    print(f"Risk Score: {risk_color}{result.risk_score:.1f}%{Style.RESET_ALL}")
-    print(f"Risk Level: {risk_color}{result.risk_level}{Style.RESET_ALL}")
+    print("\n" + "="*80, file=buf)
+    print(f"URL: {_STYLE.BRIGHT}{result.url}{_STYLE.RESET_ALL}", file=buf)
+    print(f"Risk Score: {risk_color}{result.risk_score:.1f}%{_STYLE.RESET_ALL}", file=buf)
+    print(f"Risk Level: {risk_color}{result.risk_level}{_STYLE.RESET_ALL}", file=buf)
     
     if result.risk_factors:
-        print("\nRisk Factors:")
+        print("\nRisk Factors:", file=buf)
         for factor in result.risk_factors:
-            print(f"  - {factor['description']} {Fore.CYAN}({factor['weight']} points){Style.RESET_ALL}")
+            print(f"  - {factor['description']} {_FORE.CYAN}({factor['weight']} points){_STYLE.RESET_ALL}", file=buf)
     
     if verbose and result.features:
-        print("\nDetailed Analysis:")
+        print("\nDetailed Analysis:", file=buf)
         
         # URL components
-        print(f"\n{Fore.BLUE}URL Components:{Style.RESET_ALL}")
-        print(f"  Scheme: {result.features.get('scheme', 'N/A')}")
-        print(f"  Domain: {result.features.get('domain', 'N/A')}")
-        print(f"  Subdomain: {result.features.get('subdomain', 'N/A')}")
-        print(f"  TLD: {result.features.get('tld', 'N/A')}")
-        print(f"  Path: {result.features.get('path', 'N/A')}")
+        print(f"\n{_FORE.BLUE}URL Components:{_STYLE.RESET_ALL}", file=buf)
+        print(f"  Scheme: {result.features.get('scheme', 'N/A')}", file=buf)
+        print(f"  Domain: {result.features.get('domain', 'N/A')}", file=buf)
+        print(f"  Subdomain: {result.features.get('subdomain', 'N/A')}", file=buf)
+        print(f"  TLD: {result.features.get('tld', 'N/A')}", file=buf)
+        print(f"  Path: {result.features.get('path', 'N/A')}", file=buf)
         
         # Domain intelligence
         if "domain_info" in result.features:
             domain_info = result.features["domain_info"]
-            print(f"\n{Fore.BLUE}Domain Intelligence:{Style.RESET_ALL}")
-            print(f"  Domain Age: {domain_info.get('domain_age_days', 'N/A')} days")
-            print(f"  Registrar: {domain_info.get('registrar', 'N/A')}")
-            print(f"  Creation Date: {domain_info.get('creation_date', 'N/A')}")
+            print(f"\n{_FORE.BLUE}Domain Intelligence:{_STYLE.RESET_ALL}", file=buf)
+            print(f"  Domain Age: {domain_info.get('domain_age_days', 'N/A')} days", file=buf)
+            print(f"  Registrar: {domain_info.get('registrar', 'N/A')}", file=buf)
+            print(f"  Creation Date: {domain_info.get('creation_date', 'N/A')}", file=buf)
             
         # Brand matches
         if "brand_matches" in result.features and result.features["brand_matches"]:
-            print(f"\n{Fore.BLUE}Brand Matches:{Style.RESET_ALL}")
+            print(f"\n{_FORE.BLUE}Brand Matches:{_STYLE.RESET_ALL}", file=buf)
             for match in result.features["brand_matches"]:
-                print(f"  - {match['description']}")
+                print(f"  - {match['description']}", file=buf)
+    
+    return buf.getvalue()
 
 
-def save_results(results: List[AnalysisResult], output_file: str) -> None:
+def write_result(result: AnalysisResult, output: BinaryIO) -> None:
     """
-    Save results to a JSON file.
+    Write an analysis result to a binary stream as one JSON line.
+
+    Args:
+        result (AnalysisResult): Analysis result
+        output (BinaryIO): Binary output stream
+    """
+    output.write(orjson.dumps(result.to_dict(), default=str, option=orjson.OPT_NON_STR_KEYS))
+    output.write(b"\n")
+
+
+def save_results(results: List[AnalysisResult], output_file: str, pretty: bool = False) -> None:
+    """
+    Save results to a file.
 
     Args:
         results (List[AnalysisResult]): List of analysis results
         output_file (str): Output file path
+        pretty (bool, optional): Write one indented JSON array instead of
+                                 JSON Lines. Defaults to False.
     """
     try:
-        with open(output_file, 'w') as f:
-            json_results = [result.to_dict() for result in results]
-            json.dump(json_results, f, indent=2, default=str)
+        if pretty:
+            with open(output_file, 'w') as f:
+                json_results = [result.to_dict() for result in results]
+                json.dump(json_results, f, indent=2, default=str)
+        else:
+            with open(output_file, 'wb') as f:
+                for result in results:
+                    write_result(result, f)
         logger.info(f"Results saved to {output_file}")
     except Exception as e:
         logger.error(f"Error saving results to {output_file}: {str(e)}")
@@ -217,6 +416,8 @@ def main(args: Optional[List[str]] = None) -> int:
     config = {}
     if args.brands_file:
         config["brands_file"] = args.brands_file
+    if not args.no_cache:
+        config["whois_cache_file"] = DEFAULT_WHOIS_CACHE_FILE
         
     phish_sniper = PhishSniper(config)
     
@@ -225,25 +426,46 @@ def main(args: Optional[List[str]] = None) -> int:
         parser.print_help()
         return 1
     
+    # JSON Lines output is streamed while URLs are analyzed
+    stream_output = bool(args.output) and not args.pretty
+    try:
+        output_cm = open(args.output, 'wb') if stream_output else contextlib.nullcontext()
+    except OSError as e:
+        logger.error(f"Error saving results to {args.output}: {str(e)}")
+        return 1
+    
     results = []
     
-    # Analyze single URL
-    if args.url:
-        try:
-            result = analyze_url(args.url, phish_sniper, args.verbose)
-            results.append(result)
-            print_result(result, args.verbose)
-        except Exception:
-            return 1
-    
-    # Analyze URLs from file
-    if args.file:
-        file_results = analyze_urls_from_file(args.file, phish_sniper, args.verbose)
-        results.extend(file_results)
-    
-    # Save results if output file is provided
-    if args.output and results:
-        save_results(results, args.output)
+    with output_cm as output:
+        # Analyze single URL
+        if args.url:
+            try:
+                result = analyze_url(args.url, phish_sniper, args.verbose)
+                results.append(result)
+                print_result(result, args.verbose)
+                if output is not None:
+                    write_result(result, output)
+            except Exception:
+                return 1
+        
+        # Analyze URLs from file
+        if args.file:
+            workers = args.workers
+            if workers is None:
+                workers = MAX_CONCURRENT_LOOKUPS if args.io_bound else (os.cpu_count() or 1)
+                
+            file_results = analyze_urls_from_file(
+                args.file, phish_sniper, args.verbose,
+                workers=workers, io_bound=args.io_bound, output=output
+            )
+            results.extend(file_results)
+    
+    if stream_output:
+        logger.info(f"Results saved to {args.output}")
+    
+    # Save pretty-printed results if requested
+    elif args.output and results:
+        save_results(results, args.output, pretty=True)
     
     return 0
 
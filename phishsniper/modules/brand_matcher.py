@@ -5,20 +5,75 @@ Brand Matcher module for detecting brand spoofing in URLs.
 import os
 import logging
 import json
+import functools
+from collections import Counter
 from typing import Dict, Any, List, Tuple
 import pkg_resources
 
-from fuzzywuzzy import fuzz
-import tldextract
+import ahocorasick
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Levenshtein
+
+from . import tld_extractor
 
 logger = logging.getLogger(__name__)
 
+# Number of hostnames whose brand matches are memoized per BrandMatcher
+MATCH_CACHE_SIZE = 65536
+
+# Common homoglyph replacements as (original, replacement) pairs
+HOMOGLYPHS = [
+    ('0', 'o'), ('o', '0'),
+    ('1', 'l'), ('l', '1'), ('i', '1'), ('1', 'i'),
+    ('5', 's'), ('s', '5'),
+    ('rn', 'm'), ('m', 'rn'),
+    ('cl', 'd'), ('d', 'cl'),
+    ('vv', 'w'), ('w', 'vv'),
+    ('nn', 'm'), ('m', 'nn')
+]
+
+# Length of the q-grams used to prefilter fuzzy matching candidates
+QGRAM_SIZE = 3
+
+
+@functools.lru_cache(maxsize=16)
+def _build_automaton(brands: Tuple[str, ...], variants: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over brand names and their homoglyph variants.
+
+    The automaton is read-only once built, so every BrandMatcher using the
+    same brand list in a process shares one instance. Worker processes
+    forked after the first PhishSniper is created inherit it.
+
+    Args:
+        brands (Tuple[str, ...]): Brand names
+        variants (Tuple[str, ...]): Lowercased homoglyph variants of the brands
+
+    Returns:
+        ahocorasick.Automaton: Automaton mapping each lowercased word to a
+                               (word, brand or None, is_variant) tuple
+    """
+    brand_words = {brand.lower(): brand for brand in brands}
+    variant_words = set(variants)
+    
+    automaton = ahocorasick.Automaton()
+    for word in brand_words.keys() | variant_words:
+        automaton.add_word(word, (word, brand_words.get(word), word in variant_words))
+    automaton.make_automaton()
+    return automaton
+
 
 class BrandMatcher:
     """
     Detect brand spoofing in URLs using fuzzy string matching.
     """
 
+    __slots__ = (
+        "default_brands", "brands", "_fuzzy_brands", "_fuzzy_brands_lower",
+        "_qgram_index", "_homoglyph_variants", "_automaton", "fuzzy_threshold",
+        "levenshtein_threshold", "_find_matches_cached"
+    )
+
     def __init__(self, brands_file: str = None):
         """
         Initialize the Brand Matcher.
@@ -42,12 +97,29 @@ class BrandMatcher:
         # Load brands from file if provided
         self.brands = self._load_brands(brands_file)
         
+        # Brands long enough for fuzzy matching (shorter ones cause false positives)
+        self._fuzzy_brands = [brand for brand in self.brands if len(brand) >= 4]
+        self._fuzzy_brands_lower = [brand.lower() for brand in self._fuzzy_brands]
+        
+        # Inverted index from q-gram to (brand index, occurrences) for prefiltering
+        self._qgram_index = self._build_qgram_index()
+        
+        # Homoglyph variants of each brand, generated once
+        self._homoglyph_variants = self._build_homoglyph_table()
+        
+        # Aho-Corasick automaton finding brand names and homoglyph variants in
+        # one pass, shared per process
+        self._automaton = _build_automaton(tuple(self.brands), tuple(self._homoglyph_variants))
+        
         # Threshold for fuzzy matching (0-100)
         self.fuzzy_threshold = 85
         
         # Threshold for Levenshtein distance (based on domain length)
         self.levenshtein_threshold = 2
         
+        # Brand matches depend only on the hostname, so memoize them
+        self._find_matches_cached = functools.lru_cache(maxsize=MATCH_CACHE_SIZE)(self._find_matches)
+        
         logger.debug(f"BrandMatcher initialized with {len(self.brands)} brands")
 
     def find_matches(self, hostname: str) -> List[Dict[str, Any]]:
@@ -60,31 +132,50 @@ class BrandMatcher:
         Returns:
             List[Dict[str, Any]]: List of potential brand matches
         """
+        matches = self._find_matches_cached(hostname.strip().lower())
+        
+        # Hand out copies so callers cannot alter the cached matches
+        return [dict(match) for match in matches]
+
+    def _find_matches(self, hostname: str) -> Tuple[Dict[str, Any], ...]:
+        """
+        Find potential brand matches in a normalized hostname.
+
+        Args:
+            hostname (str): The lowercased hostname to check
+
+        Returns:
+            Tuple[Dict[str, Any], ...]: Potential brand matches
+        """
         logger.debug(f"Checking for brand spoofing in: {hostname}")
         
         # Extract domain without TLD
-        extracted = tldextract.extract(hostname)
+        extracted = tld_extractor.extract(hostname)
         domain = extracted.domain
         
+        domain_lower = domain.lower()
         matches = []
         
-        # Check for exact matches in subdomain or domain
-        for brand in self.brands:
-            # Check for brand name in domain
-            if brand in domain.lower():
-                # Skip if the domain is exactly the brand name
-                if domain.lower() == brand.lower():
-                    continue
-                    
-                matches.append({
-                    "type": "brand_in_domain",
-                    "brand": brand,
-                    "value": domain,
-                    "description": f"Brand '{brand}' found in domain"
-                })
-            
-            # Check for brand name in subdomain
-            if extracted.subdomain and brand in extracted.subdomain.lower():
+        # Find brands, homoglyph variants and q-grams of the domain in one scan
+        scan = self._scan_all(domain_lower)
+        
+        # Check for brand names in domain
+        domain_hits = scan["brands"]
+        for brand in domain_hits:
+            # Skip if the domain is exactly the brand name
+            if domain_lower == brand.lower():
+                continue
+                
+            matches.append({
+                "type": "brand_in_domain",
+                "brand": brand,
+                "value": domain,
+                "description": f"Brand '{brand}' found in domain"
+            })
+        
+        # Check for brand names in subdomain
+        if extracted.subdomain:
+            for brand in self._find_brand_hits(extracted.subdomain.lower()):
                 matches.append({
                     "type": "brand_in_subdomain",
                     "brand": brand,
@@ -92,25 +183,44 @@ class BrandMatcher:
                     "description": f"Brand '{brand}' found in subdomain"
                 })
         
-        # Check for typosquatting using fuzzy matching
-        for brand in self.brands:
-            # Skip very short brands (to avoid false positives)
-            if len(brand) < 4:
-                continue
-                
-            # Calculate fuzzy match ratio
-            ratio = fuzz.ratio(domain.lower(), brand.lower())
-            
-            # Calculate Levenshtein distance
-            levenshtein = self._levenshtein_distance(domain.lower(), brand.lower())
+        # Domains already containing a brand long enough for fuzzy matching need
+        # no fuzzy or homoglyph checks; short brands like "ea" or "ups" occur by
+        # chance inside spoofed names, so they do not end the search
+        if any(len(brand) >= 4 for brand in domain_hits):
+            return tuple(matches)
+        
+        # Check for typosquatting by scoring the candidate brands in one batch
+        brands_lower = self._fuzzy_brands_lower
+        candidates = {index: brands_lower[index] for index in self._fuzzy_candidates(domain_lower, scan["qgrams"])}
+        ratios = {
+            index: score for _, score, index in process.extract(
+                domain_lower, candidates, scorer=fuzz.ratio,
+                score_cutoff=self.fuzzy_threshold - 0.5, limit=None)
+        }
+        distances = {
+            index: dist for _, dist, index in process.extract(
+                domain_lower, candidates, scorer=Levenshtein.distance,
+                score_cutoff=self.levenshtein_threshold, limit=None)
+        }
+        
+        for index in candidates:
+            brand = self._fuzzy_brands[index]
+            ratio = round(ratios.get(index, 0))
+            levenshtein = distances.get(index)
             
             # Check if it's a potential typosquatting attempt
             if (ratio >= self.fuzzy_threshold or 
-                (levenshtein <= self.levenshtein_threshold and len(brand) > 4)):
+                (levenshtein is not None and len(brand) > 4)):
                 
                 # Skip exact matches
-                if domain.lower() == brand.lower():
+                if domain_lower == brands_lower[index]:
                     continue
+                
+                # Fill in the score the batch cutoff left out
+                if index not in ratios:
+                    ratio = round(fuzz.ratio(domain_lower, brands_lower[index]))
+                if levenshtein is None:
+                    levenshtein = Levenshtein.distance(domain_lower, brands_lower[index])
                     
                 matches.append({
                     "type": "typosquatting",
@@ -122,10 +232,10 @@ class BrandMatcher:
                 })
         
         # Check for homoglyph attacks
-        homoglyph_matches = self._check_homoglyphs(domain)
+        homoglyph_matches = self._check_homoglyphs(domain, scan["homoglyphs"])
         matches.extend(homoglyph_matches)
         
-        return matches
+        return tuple(matches)
 
     def _load_brands(self, brands_file: str = None) -> List[str]:
         """
@@ -146,87 +256,175 @@ class BrandMatcher:
                 
         return self.default_brands
 
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
+    def _scan_all(self, domain: str) -> Dict[str, Any]:
         """
-        Calculate the Levenshtein distance between two strings.
+        Scan a lowercased domain once for everything the matchers need.
+
+        A single automaton pass yields both the brand names and the homoglyph
+        variants occurring in the domain, alongside its q-gram counts for the
+        fuzzy prefilter.
 
         Args:
-            s1 (str): First string
-            s2 (str): Second string
+            domain (str): Lowercased domain to scan
 
         Returns:
-            int: Levenshtein distance
+            Dict[str, Any]: "brands" and "homoglyphs" hits in order of first
+                            occurrence, and "qgrams" counts
         """
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
+        brand_hits = []
+        homoglyph_hits = []
+        
+        if self._automaton:
+            for _, (word, brand, is_variant) in self._automaton.iter(domain):
+                if brand is not None and brand not in brand_hits:
+                    brand_hits.append(brand)
+                if is_variant and word not in homoglyph_hits:
+                    homoglyph_hits.append(word)
+                    
+        return {
+            "brands": brand_hits,
+            "homoglyphs": homoglyph_hits,
+            "qgrams": self._qgrams(domain)
+        }
+
+    def _find_brand_hits(self, text: str) -> List[str]:
+        """
+        Find all brands occurring in a lowercased string.
+
+        Args:
+            text (str): Lowercased string to scan
+
+        Returns:
+            List[str]: Brands found, in order of first occurrence
+        """
+        hits = []
+        if not self._automaton:
+            return hits
+            
+        for _, (_, brand, _) in self._automaton.iter(text):
+            if brand is not None and brand not in hits:
+                hits.append(brand)
+        return hits
+
+    def _build_qgram_index(self) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Build an inverted index from q-gram to the fuzzy brands containing it.
+
+        Returns:
+            Dict[str, List[Tuple[int, int]]]: Q-gram mapped to (brand index, occurrences)
+        """
+        index = {}
+        for brand_index, brand_lower in enumerate(self._fuzzy_brands_lower):
+            for qgram, count in self._qgrams(brand_lower).items():
+                index.setdefault(qgram, []).append((brand_index, count))
+        return index
 
-        if len(s2) == 0:
-            return len(s1)
+    def _fuzzy_candidates(self, domain: str, qgrams: Counter) -> List[int]:
+        """
+        Select the fuzzy brands that could possibly match a domain.
 
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
+        Uses the q-gram lemma: strings within Levenshtein distance k share at
+        least max(len) - q + 1 - k*q q-grams. The distance bound covers both the
+        Levenshtein threshold and the fuzzy ratio threshold, so no brand that
+        could match is ever filtered out.
 
-        return previous_row[-1]
+        Args:
+            domain (str): The lowercased domain
+            qgrams (Counter): Q-gram counts of the domain
 
-    def _check_homoglyphs(self, domain: str) -> List[Dict[str, Any]]:
+        Returns:
+            List[int]: Indices into the fuzzy brand list, in brand order
+        """
+        shared = Counter()
+        for qgram, count in qgrams.items():
+            for brand_index, brand_count in self._qgram_index.get(qgram, ()):
+                shared[brand_index] += min(count, brand_count)
+                
+        # Largest Indel distance (an upper bound on Levenshtein) still reaching the ratio threshold
+        max_indel_fraction = 1 - (self.fuzzy_threshold - 0.5) / 100
+        
+        candidates = []
+        for brand_index, brand_lower in enumerate(self._fuzzy_brands_lower):
+            max_distance = int(max_indel_fraction * (len(domain) + len(brand_lower)))
+            if len(brand_lower) > 4:
+                max_distance = max(max_distance, self.levenshtein_threshold)
+                
+            if abs(len(domain) - len(brand_lower)) > max_distance:
+                continue
+                
+            min_shared = max(len(domain), len(brand_lower)) - QGRAM_SIZE + 1 - max_distance * QGRAM_SIZE
+            if shared[brand_index] >= min_shared:
+                candidates.append(brand_index)
+                
+        return candidates
+
+    @staticmethod
+    def _qgrams(text: str) -> Counter:
+        """
+        Count the q-grams of a string.
+
+        Args:
+            text (str): The string to split
+
+        Returns:
+            Counter: Q-gram occurrence counts
+        """
+        return Counter(text[i:i + QGRAM_SIZE] for i in range(len(text) - QGRAM_SIZE + 1))
+
+    def _build_homoglyph_table(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """
+        Generate the homoglyph variants of every brand.
+
+        Returns:
+            Dict[str, List[Tuple[str, str, str]]]: Lowercased variant mapped to the
+                                                   (brand, original, replacement)
+                                                   tuples producing it
+        """
+        variants = {}
+        
+        for brand, brand_lower in zip(self._fuzzy_brands, self._fuzzy_brands_lower):
+            # Try replacing homoglyphs in the brand name
+            for original, replacement in HOMOGLYPHS:
+                if original in brand_lower:
+                    modified_brand = brand_lower.replace(original, replacement)
+                    variants.setdefault(modified_brand, []).append((brand, original, replacement))
+        
+        return variants
+
+    def _check_homoglyphs(self, domain: str, variants_found: List[str]) -> List[Dict[str, Any]]:
         """
         Check for homoglyph attacks (similar-looking characters).
 
         Args:
             domain (str): The domain to check
+            variants_found (List[str]): Homoglyph variants occurring in the domain
 
         Returns:
             List[Dict[str, Any]]: List of potential homoglyph matches
         """
-        # Common homoglyph replacements
-        homoglyphs = {
-            '0': 'o', 'o': '0',
-            '1': 'l', 'l': '1', 'i': '1', '1': 'i',
-            '5': 's', 's': '5',
-            'rn': 'm', 'm': 'rn',
-            'cl': 'd', 'd': 'cl',
-            'vv': 'w', 'w': 'vv',
-            'nn': 'm', 'm': 'nn'
-        }
-        
+        domain_lower = domain.lower()
         matches = []
         
-        # Check each brand
-        for brand in self.brands:
-            # Skip very short brands
-            if len(brand) < 4:
-                continue
-                
-            # Try replacing homoglyphs in the brand name
-            for original, replacement in homoglyphs.items():
-                if original in brand:
-                    modified_brand = brand.replace(original, replacement)
+        for modified_brand in variants_found:
+            for brand, original, replacement in self._homoglyph_variants[modified_brand]:
+                # If the modified brand matches the domain
+                if domain_lower == modified_brand:
+                    matches.append({
+                        "type": "homoglyph_attack",
+                        "brand": brand,
+                        "value": domain,
+                        "substitution": f"'{original}' to '{replacement}'",
+                        "description": f"Homoglyph attack on '{brand}' (replacing '{original}' with '{replacement}')"
+                    })
                     
-                    # If the modified brand matches the domain
-                    if domain.lower() == modified_brand.lower():
-                        matches.append({
-                            "type": "homoglyph_attack",
-                            "brand": brand,
-                            "value": domain,
-                            "substitution": f"'{original}' to '{replacement}'",
-                            "description": f"Homoglyph attack on '{brand}' (replacing '{original}' with '{replacement}')"
-                        })
-                        
-                    # Also check for partial matches in longer domains
-                    elif modified_brand.lower() in domain.lower():
-                        matches.append({
-                            "type": "partial_homoglyph",
-                            "brand": brand,
-                            "value": domain,
-                            "substitution": f"'{original}' to '{replacement}'",
-                            "description": f"Partial homoglyph match for '{brand}' in domain"
-                        })
-        
-        return matches 
\ No newline at end of file
+                # Also check for partial matches in longer domains
+                else:
+                    matches.append({
+                        "type": "partial_homoglyph",
+                        "brand": brand,
+                        "value": domain,
+                        "substitution": f"'{original}' to '{replacement}'",
+                        "description": f"Partial homoglyph match for '{brand}' in domain"
+                    })
+        
+        return matches
@@ -2,24 +2,179 @@
 Domain Intelligence module for WHOIS lookups and domain analysis.
 """
 
+import os
+import json
+import time
+import types
+import sqlite3
+import asyncio
 import logging
 import datetime
-import socket
-from typing import Dict, Any, Optional
+import ipaddress
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 
 import whois
-import tldextract
+import whois.parser
+
+from . import tld_extractor
 
 logger = logging.getLogger(__name__)
 
+# Default bound on concurrent analyses, and so WHOIS lookups, in a batch
+MAX_CONCURRENT_LOOKUPS = 64
+
+# TCP port WHOIS servers listen on
+WHOIS_PORT = 43
+
+# Default location of the persistent WHOIS cache
+DEFAULT_WHOIS_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "phishsniper", "whois.db")
+
+
+def _whois_query_string(server: str, query: str, many_results: bool = False) -> str:
+    """
+    Build the query line NICClient sends to a WHOIS server.
+
+    Some servers expect extra options or a different query form, so the
+    asynchronous client must rewrite queries exactly as NICClient.whois does
+    to get back the text the synchronous lookup parses.
+
+    Args:
+        server (str): WHOIS server hostname
+        query (str): IDNA-encoded domain
+        many_results (bool, optional): Use the "=" query form. Defaults to False.
+
+    Returns:
+        str: Query line, without the line terminator
+    """
+    if server == whois.NICClient.DENICHOST:
+        return "-T dn,ace -C UTF-8 " + query
+    if server == whois.NICClient.DK_HOST:
+        return " --show-handles " + query
+    if server.endswith(".jp"):
+        return query + "/e"
+    if server.endswith(whois.NICClient.QNICHOST_TAIL) and many_results:
+        return "=" + query
+    return query
+
+
+class WhoisCache:
+    """
+    Persist WHOIS lookups in SQLite so recurring domains skip the network.
+    """
+
+    def __init__(self, cache_file: str, ttl: float = 24 * 60 * 60):
+        """
+        Initialize the WHOIS cache.
+
+        Args:
+            cache_file (str): Path to the SQLite database file
+            ttl (float, optional): Seconds an entry stays fresh. Defaults to 24 hours.
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        
+        # The connection is opened lazily, once per process
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> Optional[Any]:
+        """
+        Get a fresh cached WHOIS entry.
+
+        Args:
+            domain (str): The registered domain
+
+        Returns:
+            Optional[Any]: WHOIS entry with the attributes used by DomainIntelligence,
+                           or None if the domain is not cached or the entry expired
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT fetched_ts, payload FROM whois WHERE domain = ?", (domain,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"WHOIS cache read failed for {domain}: {str(e)}")
+            return None
+            
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+            
+        payload = json.loads(row[1])
+        for key in ("creation_date", "expiration_date", "updated_date"):
+            if payload[key]:
+                payload[key] = datetime.datetime.fromisoformat(payload[key])
+                
+        return types.SimpleNamespace(**payload)
+
+    def set(self, domain: str, whois_info: Any) -> None:
+        """
+        Store a WHOIS entry.
+
+        Args:
+            domain (str): The registered domain
+            whois_info: Parsed WHOIS entry
+        """
+        payload = {"domain_name": whois_info.domain_name, "registrar": whois_info.registrar}
+        for key in ("creation_date", "expiration_date", "updated_date"):
+            value = getattr(whois_info, key)
+            if isinstance(value, list):
+                value = value[0] if value else None
+            payload[key] = value.isoformat() if isinstance(value, datetime.datetime) else None
+            
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO whois (domain, fetched_ts, payload) VALUES (?, ?, ?)",
+                    (domain, time.time(), json.dumps(payload, default=str))
+                )
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"WHOIS cache write failed for {domain}: {str(e)}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database for the current process, creating it if needed.
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                
+            self._conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS whois "
+                "(domain TEXT PRIMARY KEY, fetched_ts REAL, payload TEXT)"
+            )
+            self._pid = os.getpid()
+            
+        return self._conn
+
 
 class DomainIntelligence:
     """
     Perform WHOIS lookups and analyze domain information.
     """
 
-    def __init__(self):
-        """Initialize the Domain Intelligence module."""
+    __slots__ = (
+        "suspicious_registrars", "min_domain_age", "whois_timeout",
+        "_whois_servers", "_inflight_lookups", "whois_cache"
+    )
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Initialize the Domain Intelligence module.
+
+        Args:
+            cache_file (str, optional): SQLite file for caching WHOIS lookups.
+                                        None (the default) disables the cache.
+        """
         # List of suspicious registrars often associated with malicious domains
         self.suspicious_registrars = {
             "namecheap", "namesilo", "namebright", "porkbun", 
@@ -29,6 +184,18 @@ class DomainIntelligence:
         # Minimum domain age considered legitimate (in days)
         self.min_domain_age = 30
         
+        # Timeout for asynchronous WHOIS lookups (in seconds)
+        self.whois_timeout = 10
+        
+        # WHOIS server per TLD, discovered on first asynchronous lookup
+        self._whois_servers: Dict[str, Optional[str]] = {}
+        
+        # Asynchronous WHOIS lookups in flight, per event loop and domain
+        self._inflight_lookups: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        
+        # Persistent WHOIS cache
+        self.whois_cache = WhoisCache(cache_file) if cache_file else None
+        
         logger.debug("DomainIntelligence initialized")
 
     def analyze(self, hostname: str) -> Dict[str, Any]:
@@ -43,12 +210,119 @@ class DomainIntelligence:
         """
         logger.debug(f"Analyzing domain intelligence for: {hostname}")
         
-        # Extract domain from hostname (remove port if present)
-        if ":" in hostname:
+        hostname, domain, result = self._prepare_result(hostname)
+        
+        # Skip WHOIS lookup for IP addresses
+        if self._is_ip_address(hostname):
+            self._add_ip_address_trait(result, hostname)
+            return result
+        
+        try:
+            # Perform WHOIS lookup, unless a fresh copy is cached
+            whois_info = self.whois_cache.get(domain) if self.whois_cache else None
+            if whois_info is None:
+                whois_info = whois.whois(domain)
+                if self.whois_cache:
+                    self.whois_cache.set(domain, whois_info)
+            self._apply_whois_info(result, domain, whois_info)
+        except Exception as e:
+            self._add_lookup_failed_trait(result, domain, e)
+        
+        return result
+
+    async def analyze_async(self, hostname: str) -> Dict[str, Any]:
+        """
+        Analyze domain intelligence for a given hostname without blocking.
+
+        The WHOIS query is sent over an asyncio connection, so many lookups
+        can be in flight on a single thread. Concurrent calls for the same
+        domain share a single lookup.
+
+        Args:
+            hostname (str): The hostname to analyze
+
+        Returns:
+            Dict[str, Any]: Domain intelligence information
+        """
+        logger.debug(f"Analyzing domain intelligence for: {hostname}")
+        
+        hostname, domain, result = self._prepare_result(hostname)
+        
+        # Skip WHOIS lookup for IP addresses
+        if self._is_ip_address(hostname):
+            self._add_ip_address_trait(result, hostname)
+            return result
+        
+        try:
+            whois_info = await self._lookup_async(domain)
+            self._apply_whois_info(result, domain, whois_info)
+        except Exception as e:
+            self._add_lookup_failed_trait(result, domain, e)
+        
+        return result
+
+    async def _lookup_async(self, domain: str) -> Any:
+        """
+        Look up a domain, joining a lookup for it already in flight.
+
+        Without this, a batch with repeated domains would send one query per
+        repeat, as all of them miss the cache before the first one finishes.
+
+        Args:
+            domain (str): The registered domain
+
+        Returns:
+            WHOIS information for the domain
+        """
+        key = (asyncio.get_running_loop(), domain)
+        lookup = self._inflight_lookups.get(key)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._fetch_whois_async(domain))
+            self._inflight_lookups[key] = lookup
+            lookup.add_done_callback(lambda _: self._inflight_lookups.pop(key, None))
+            
+        # Shielded so one caller giving up does not cancel the others' lookup
+        return await asyncio.shield(lookup)
+
+    async def _fetch_whois_async(self, domain: str) -> Any:
+        """
+        Fetch WHOIS information for a domain, unless a fresh copy is cached.
+
+        Args:
+            domain (str): The registered domain
+
+        Returns:
+            WHOIS information for the domain
+        """
+        whois_info = self.whois_cache.get(domain) if self.whois_cache else None
+        if whois_info is None:
+            whois_info = await asyncio.wait_for(self._whois_async(domain), self.whois_timeout)
+            if self.whois_cache:
+                self.whois_cache.set(domain, whois_info)
+        return whois_info
+
+    def _prepare_result(self, hostname: str) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Normalize a hostname and create an empty analysis result for it.
+
+        Args:
+            hostname (str): The hostname to analyze
+
+        Returns:
+            Tuple[str, str, Dict[str, Any]]: Hostname without port, registered
+                                             domain, and the initial result
+        """
+        # Extract domain from hostname (remove port and IPv6 brackets if present)
+        if hostname.startswith("["):
+            hostname = hostname[1:].split("]")[0]
+        elif hostname.count(":") == 1:
             hostname = hostname.split(":")[0]
             
+        # Hostnames are case-insensitive, so one domain gets one cache entry
+        hostname = hostname.lower()
+        
         # Extract the domain without subdomains
-        extracted = tldextract.extract(hostname)
+        extracted = tld_extractor.extract(hostname)
         domain = f"{extracted.domain}.{extracted.suffix}" if extracted.suffix else extracted.domain
         
         # Initialize result
@@ -63,76 +337,175 @@ class DomainIntelligence:
             "suspicious_traits": []
         }
         
-        # Skip WHOIS lookup for IP addresses
-        if self._is_ip_address(hostname):
+        return hostname, domain, result
+
+    def _apply_whois_info(self, result: Dict[str, Any], domain: str, whois_info: Any) -> None:
+        """
+        Fill in a result from WHOIS data and flag suspicious registration traits.
+
+        Args:
+            result (Dict[str, Any]): Result to update
+            domain (str): The registered domain
+            whois_info: Parsed WHOIS entry
+        """
+        # Check if domain exists
+        if whois_info.domain_name is None:
             result["suspicious_traits"].append({
-                "type": "ip_address_no_whois",
-                "value": hostname,
-                "description": "IP address used instead of domain name (no WHOIS data)"
+                "type": "non_existent_domain",
+                "value": domain,
+                "description": "Domain does not exist in WHOIS records"
             })
-            return result
+            return
+            
+        result["domain_exists"] = True
         
-        try:
-            # Perform WHOIS lookup
-            whois_info = whois.whois(domain)
+        # Extract WHOIS information
+        result["creation_date"] = self._get_first_date(whois_info.creation_date)
+        result["expiration_date"] = self._get_first_date(whois_info.expiration_date)
+        result["last_updated"] = self._get_first_date(whois_info.updated_date)
+        result["registrar"] = whois_info.registrar
+        
+        # Calculate domain age
+        if result["creation_date"]:
+            age = datetime.datetime.now() - result["creation_date"]
+            result["domain_age_days"] = age.days
             
-            # Check if domain exists
-            if whois_info.domain_name is None:
+            # Check if domain is newly created
+            if age.days < self.min_domain_age:
                 result["suspicious_traits"].append({
-                    "type": "non_existent_domain",
-                    "value": domain,
-                    "description": "Domain does not exist in WHOIS records"
+                    "type": "new_domain",
+                    "value": age.days,
+                    "description": f"Domain was registered recently ({age.days} days ago)"
                 })
-                return result
-                
-            result["domain_exists"] = True
-            
-            # Extract WHOIS information
-            result["creation_date"] = self._get_first_date(whois_info.creation_date)
-            result["expiration_date"] = self._get_first_date(whois_info.expiration_date)
-            result["last_updated"] = self._get_first_date(whois_info.updated_date)
-            result["registrar"] = whois_info.registrar
-            
-            # Calculate domain age
-            if result["creation_date"]:
-                age = datetime.datetime.now() - result["creation_date"]
-                result["domain_age_days"] = age.days
-                
-                # Check if domain is newly created
-                if age.days < self.min_domain_age:
-                    result["suspicious_traits"].append({
-                        "type": "new_domain",
-                        "value": age.days,
-                        "description": f"Domain was registered recently ({age.days} days ago)"
-                    })
+        
+        # Check for suspicious registrar
+        if result["registrar"] and any(sr in str(result["registrar"]).lower() for sr in self.suspicious_registrars):
+            result["suspicious_traits"].append({
+                "type": "suspicious_registrar",
+                "value": result["registrar"],
+                "description": f"Domain registered with suspicious registrar: {result['registrar']}"
+            })
             
-            # Check for suspicious registrar
-            if result["registrar"] and any(sr in str(result["registrar"]).lower() for sr in self.suspicious_registrars):
+        # Check for short registration period
+        if result["creation_date"] and result["expiration_date"]:
+            registration_period = result["expiration_date"] - result["creation_date"]
+            if registration_period.days < 365:
                 result["suspicious_traits"].append({
-                    "type": "suspicious_registrar",
-                    "value": result["registrar"],
-                    "description": f"Domain registered with suspicious registrar: {result['registrar']}"
+                    "type": "short_registration",
+                    "value": registration_period.days,
+                    "description": f"Short registration period ({registration_period.days} days)"
                 })
-                
-            # Check for short registration period
-            if result["creation_date"] and result["expiration_date"]:
-                registration_period = result["expiration_date"] - result["creation_date"]
-                if registration_period.days < 365:
-                    result["suspicious_traits"].append({
-                        "type": "short_registration",
-                        "value": registration_period.days,
-                        "description": f"Short registration period ({registration_period.days} days)"
-                    })
-                    
-        except Exception as e:
-            logger.warning(f"WHOIS lookup failed for {domain}: {str(e)}")
-            result["suspicious_traits"].append({
-                "type": "whois_lookup_failed",
-                "value": str(e),
-                "description": "WHOIS lookup failed, which may indicate a suspicious domain"
-            })
+
+    def _add_ip_address_trait(self, result: Dict[str, Any], hostname: str) -> None:
+        """
+        Flag a hostname that is an IP address and therefore has no WHOIS data.
+
+        Args:
+            result (Dict[str, Any]): Result to update
+            hostname (str): The IP address hostname
+        """
+        result["suspicious_traits"].append({
+            "type": "ip_address_no_whois",
+            "value": hostname,
+            "description": "IP address used instead of domain name (no WHOIS data)"
+        })
+
+    def _add_lookup_failed_trait(self, result: Dict[str, Any], domain: str, error: Exception) -> None:
+        """
+        Flag a failed WHOIS lookup.
+
+        Args:
+            result (Dict[str, Any]): Result to update
+            domain (str): The registered domain
+            error (Exception): The lookup error
+        """
+        logger.warning(f"WHOIS lookup failed for {domain}: {str(error)}")
+        result["suspicious_traits"].append({
+            "type": "whois_lookup_failed",
+            "value": str(error),
+            "description": "WHOIS lookup failed, which may indicate a suspicious domain"
+        })
+
+    async def _whois_async(self, domain: str) -> Any:
+        """
+        Perform a WHOIS lookup over asyncio connections.
+
+        Queries the registry WHOIS server for the TLD and follows a referral
+        to the registrar WHOIS server when the registry provides one, sending
+        the same queries as the synchronous whois.whois lookup.
+
+        Args:
+            domain (str): The registered domain
+
+        Returns:
+            Parsed WHOIS entry
+        """
+        query = domain.encode("idna").decode("ascii")
+        server = await self._whois_server_async(query)
+        if not server:
+            raise ValueError(f"No WHOIS server known for {domain}")
+            
+        text = await self._whois_query_async(server, query)
+        return whois.parser.WhoisEntry.load(query, text)
+
+    async def _whois_server_async(self, domain: str) -> Optional[str]:
+        """
+        Find the WHOIS server responsible for a domain's TLD.
+
+        Server discovery may query IANA with a blocking socket, so it runs
+        in the default executor and its answer is cached per TLD.
+
+        Args:
+            domain (str): The IDNA-encoded registered domain
+
+        Returns:
+            Optional[str]: WHOIS server hostname, or None if unknown
+        """
+        tld = domain.rsplit(".", 1)[-1]
+        if tld not in self._whois_servers:
+            loop = asyncio.get_running_loop()
+            self._whois_servers[tld] = await loop.run_in_executor(
+                None, whois.NICClient().choose_server, domain
+            )
+        return self._whois_servers[tld]
+
+    async def _whois_query_async(self, server: str, query: str, recurse: bool = True,
+                                 many_results: bool = False) -> str:
+        """
+        Send a WHOIS query to a server and read the full reply.
+
+        Mirrors NICClient.whois: the query is rewritten for the server, a
+        server asking for "=xxx" queries is retried that way, and a referral
+        to another server is followed once.
+
+        Args:
+            server (str): WHOIS server hostname
+            query (str): IDNA-encoded domain
+            recurse (bool, optional): Follow a referral. Defaults to True.
+            many_results (bool, optional): Send the "=" query form. Defaults to False.
+
+        Returns:
+            str: Raw WHOIS response, including any referral response
+        """
+        reader, writer = await asyncio.open_connection(server, WHOIS_PORT)
+        try:
+            writer.write(_whois_query_string(server, query, many_results).encode("utf-8") + b"\r\n")
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        text = response.decode("utf-8", "replace")
         
-        return result
+        if 'with "=xxx"' in text and not many_results:
+            return await self._whois_query_async(server, query, recurse, many_results=True)
+            
+        if recurse:
+            referral = whois.NICClient().findwhois_server(text, server, query)
+            if referral:
+                text += await self._whois_query_async(referral, query, recurse=False)
+                
+        return text
         
     def _get_first_date(self, date_value) -> Optional[datetime.datetime]:
         """
@@ -162,8 +535,20 @@ class DomainIntelligence:
         Returns:
             bool: True if the hostname is an IP address, False otherwise
         """
-        try:
-            socket.inet_aton(hostname)
-            return True
-        except socket.error:
-            return False 
\ No newline at end of file
+        # IPv6 hosts are the only ones containing colons once the port is stripped
+        if ":" in hostname:
+            try:
+                ipaddress.IPv6Address(hostname)
+                return True
+            except ValueError:
+                return False
+                
+        # Validate only hosts shaped like a dotted quad, as URLParser does
+        if hostname.count(".") == 3 and hostname[:1].isdigit():
+            try:
+                ipaddress.IPv4Address(hostname)
+                return True
+            except ValueError:
+                return False
+                
+        return False
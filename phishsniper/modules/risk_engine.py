@@ -3,6 +3,8 @@ Risk Engine module for calculating phishing risk scores.
 """
 
 import logging
+import itertools
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
@@ -49,72 +51,63 @@ class RiskEngine:
         
         logger.debug("RiskEngine initialized")
 
-    def calculate_risk(self, features: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+    def calculate_risk(self, url_features: Dict[str, Any], domain_info: Dict[str, Any],
+                       brand_matches: List[Dict[str, Any]]) -> Tuple[float, List[Dict[str, Any]]]:
         """
         Calculate the phishing risk score based on URL features.
 
         Args:
-            features (Dict[str, Any]): URL features from all analyzers
+            url_features (Dict[str, Any]): URL parser features
+            domain_info (Dict[str, Any]): Domain intelligence information
+            brand_matches (List[Dict[str, Any]]): Brand matches
 
         Returns:
             Tuple[float, List[Dict[str, Any]]]: Risk score (0-100) and list of risk factors
         """
         logger.debug("Calculating risk score")
         
+        risk_weights = self.risk_weights
         risk_factors = []
         total_weight = 0
         
-        # Process URL suspicious traits
-        if "suspicious_traits" in features:
-            for trait in features["suspicious_traits"]:
-                trait_type = trait["type"]
-                if trait_type in self.risk_weights:
-                    weight = self.risk_weights[trait_type]
-                    total_weight += weight
-                    risk_factors.append({
-                        "type": trait_type,
-                        "weight": weight,
-                        "description": trait["description"]
-                    })
+        # Brand match, URL and domain intelligence traits are scored in a single
+        # pass. Brand matches are the strongest signals and URL traits are
+        # deterministic, so both come before the network-dependent WHOIS traits
+        # and the factors reported do not depend on whether WHOIS answered.
+        traits = itertools.chain(
+            brand_matches or (),
+            url_features.get("suspicious_traits", ()),
+            (domain_info or {}).get("suspicious_traits", ())
+        )
         
-        # Process domain intelligence suspicious traits
-        if "domain_info" in features and "suspicious_traits" in features["domain_info"]:
-            for trait in features["domain_info"]["suspicious_traits"]:
-                trait_type = trait["type"]
-                if trait_type in self.risk_weights:
-                    weight = self.risk_weights[trait_type]
-                    total_weight += weight
-                    risk_factors.append({
-                        "type": trait_type,
-                        "weight": weight,
-                        "description": trait["description"]
-                    })
-        
-        # Process brand matches
-        if "brand_matches" in features:
-            for match in features["brand_matches"]:
-                match_type = match["type"]
-                if match_type in self.risk_weights:
-                    weight = self.risk_weights[match_type]
-                    
-                    # Adjust weight for typosquatting based on similarity
-                    if match_type == "typosquatting" and "similarity" in match:
-                        # Higher similarity = higher risk
-                        similarity_factor = match["similarity"] / 100
-                        weight = int(weight * similarity_factor)
-                    
-                    total_weight += weight
-                    risk_factors.append({
-                        "type": match_type,
-                        "weight": weight,
-                        "description": match["description"]
-                    })
+        for trait in traits:
+            trait_type = trait["type"]
+            weight = risk_weights.get(trait_type)
+            if weight is None:
+                continue
+                
+            # Adjust weight for typosquatting based on similarity
+            if trait_type == "typosquatting" and "similarity" in trait:
+                # Higher similarity = higher risk
+                similarity_factor = trait["similarity"] / 100
+                weight = int(weight * similarity_factor)
+                
+            total_weight += weight
+            risk_factors.append({
+                "type": trait_type,
+                "weight": weight,
+                "description": trait["description"]
+            })
+            
+            # Further factors cannot raise the capped score
+            if total_weight >= self.max_risk_score:
+                break
         
         # Calculate final risk score (capped at 100)
         risk_score = min(total_weight, self.max_risk_score)
         
         # Sort risk factors by weight (descending)
-        risk_factors.sort(key=lambda x: x["weight"], reverse=True)
+        risk_factors.sort(key=itemgetter("weight"), reverse=True)
         
         logger.info(f"Risk score: {risk_score}%, Risk factors: {len(risk_factors)}")
         return risk_score, risk_factors
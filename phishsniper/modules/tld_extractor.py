@@ -0,0 +1,28 @@
+"""
+TLD Extractor module providing shared, cached public suffix extraction.
+"""
+
+import functools
+
+import tldextract
+
+# Number of hostnames whose extraction results are memoized
+EXTRACT_CACHE_SIZE = 100000
+
+# Single extractor using the bundled public suffix list snapshot, so calls
+# never touch the network or the on-disk suffix list cache
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, fallback_to_snapshot=True)
+
+
+@functools.lru_cache(maxsize=EXTRACT_CACHE_SIZE)
+def extract(hostname: str) -> tldextract.tldextract.ExtractResult:
+    """
+    Split a hostname into subdomain, domain and suffix.
+
+    Args:
+        hostname (str): The hostname (or URL) to split
+
+    Returns:
+        tldextract.tldextract.ExtractResult: Extracted domain parts
+    """
+    return _TLD_EXTRACT(hostname)
@@ -3,7 +3,9 @@ URL Parser module for decomposing and analyzing URLs.
 """
 
 import re
+import string
 import logging
+import functools
 import urllib.parse
 import ipaddress
 from typing import Dict, Any, List, Tuple
@@ -11,35 +13,53 @@ from typing import Dict, Any, List, Tuple
 import tldextract
 import validators
 
+from . import tld_extractor
+
 logger = logging.getLogger(__name__)
 
+# Number of parsed URLs memoized per URLParser
+PARSE_CACHE_SIZE = 4096
+
+# Suspicious TLDs often used in phishing
+SUSPICIOUS_TLDS = frozenset({
+    "tk", "ml", "ga", "cf", "gq", "xyz", "top", "work", "date", "bid",
+    "stream", "racing", "win", "review", "country", "science", "download"
+})
+
+# Regular expressions for detecting obfuscation, compiled once per process
+_HEX_RE = re.compile(r'%[0-9a-fA-F]{2}')
+_UNICODE_RE = re.compile(r'\\u[0-9a-fA-F]{4}|\\x[0-9a-fA-F]{2}')
+
+# Translation table deleting the characters allowed in an ASCII domain,
+# leaving only the special characters to be counted
+_DOMAIN_CHARS_TABLE = str.maketrans("", "", string.ascii_letters + string.digits + ".-:")
+
 
 class URLParser:
     """
     Parse and analyze URL components for suspicious traits.
     """
 
+    __slots__ = ("suspicious_tlds", "_parse_cached")
+
     def __init__(self):
         """Initialize the URL parser."""
         # Suspicious TLDs often used in phishing
-        self.suspicious_tlds = {
-            "tk", "ml", "ga", "cf", "gq", "xyz", "top", "work", "date", "bid",
-            "stream", "racing", "win", "review", "country", "science", "download"
-        }
+        self.suspicious_tlds = SUSPICIOUS_TLDS
         
-        # Regular expressions for detecting obfuscation
-        self.hex_pattern = re.compile(r'%[0-9a-fA-F]{2}')
-        self.ip_pattern = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
-        self.unicode_pattern = re.compile(r'\\u[0-9a-fA-F]{4}|\\x[0-9a-fA-F]{2}')
+        # Parsing is a pure function of the URL, so repeated URLs are memoized
+        self._parse_cached = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
         
         logger.debug("URLParser initialized")
 
-    def parse(self, url: str) -> Dict[str, Any]:
+    def parse(self, url: str, include_query_params: bool = True) -> Dict[str, Any]:
         """
         Parse a URL and extract its components.
 
         Args:
             url (str): The URL to parse
+            include_query_params (bool, optional): Whether to decode the query string
+                                                   into "query_params". Defaults to True.
 
         Returns:
             Dict[str, Any]: Dictionary of URL components and features
@@ -48,44 +68,66 @@ class URLParser:
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
             
+        # Hand out copies so callers cannot alter the cached result
+        result = self._parse_cached(url)
+        result = {
+            **result,
+            "suspicious_traits": [dict(trait) for trait in result["suspicious_traits"]]
+        }
+        
+        # Get query parameters, which no analysis step depends on
+        if include_query_params:
+            result["query_params"] = urllib.parse.parse_qs(result["query"])
+            
+        return result
+
+    def _parse(self, url: str) -> Dict[str, Any]:
+        """
+        Parse a URL that already carries a scheme.
+
+        Args:
+            url (str): The URL to parse
+
+        Returns:
+            Dict[str, Any]: Dictionary of URL components and features
+        """
         logger.debug(f"Parsing URL: {url}")
         
         # Parse URL
         parsed = urllib.parse.urlparse(url)
         
-        # Extract domain parts using tldextract
-        extracted = tldextract.extract(url)
-        
-        # Get query parameters
-        query_params = urllib.parse.parse_qs(parsed.query)
+        # Extract domain parts from the already isolated hostname with the
+        # shared, memoized extractor
+        extracted = tld_extractor.extract(parsed.hostname or "")
         
         # Analyze suspicious traits
-        suspicious_traits = self._analyze_suspicious_traits(parsed, extracted)
+        suspicious_traits = self._analyze_suspicious_traits(url, parsed, extracted)
         
         # Prepare result
         result = {
             "url": url,
             "scheme": parsed.scheme,
             "hostname": parsed.netloc,
+            "host": parsed.hostname or "",
             "path": parsed.path,
             "query": parsed.query,
             "fragment": parsed.fragment,
             "domain": extracted.domain,
             "subdomain": extracted.subdomain,
             "tld": extracted.suffix,
-            "query_params": query_params,
             "suspicious_traits": suspicious_traits
         }
         
         logger.debug(f"URL parsed: {result}")
         return result
 
-    def _analyze_suspicious_traits(self, parsed: urllib.parse.ParseResult, 
+    def _analyze_suspicious_traits(self, url: str, parsed: urllib.parse.ParseResult, 
                                   extracted: tldextract.ExtractResult) -> List[Dict[str, Any]]:
         """
         Analyze URL for suspicious traits.
 
         Args:
+            url (str): The URL being analyzed
             parsed (urllib.parse.ParseResult): Parsed URL
             extracted (tldextract.ExtractResult): Extracted domain parts
 
@@ -94,43 +136,53 @@ class URLParser:
         """
         suspicious_traits = []
         netloc = parsed.netloc
+        netloc_lower = netloc.lower()
+        
+        # Host and port as already split out by urlparse
+        host = parsed.hostname or ""
+        try:
+            port = parsed.port
+        except ValueError:
+            # Non-numeric or out-of-range port
+            port = netloc.rpartition(":")[2]
         
         # Check for non-standard port
-        if ":" in netloc and not netloc.endswith((":80", ":443")):
-            port = netloc.split(":")[-1]
+        if port is not None and port not in (80, 443):
             suspicious_traits.append({
                 "type": "non_standard_port",
-                "value": port,
+                "value": str(port),
                 "description": f"Non-standard port {port} in use"
             })
         
-        # Check for IP address instead of domain name
-        if self.ip_pattern.search(netloc.split(":")[0]):
-            suspicious_traits.append({
-                "type": "ip_address",
-                "value": netloc.split(":")[0],
-                "description": "IP address used instead of domain name"
-            })
-            
-            # Check if IP is private
+        # Check for IP address instead of domain name, validating only
+        # hosts shaped like a dotted quad
+        if host.count(".") == 3 and host[:1].isdigit():
             try:
-                ip = netloc.split(":")[0]
-                if ipaddress.ip_address(ip).is_private:
+                ip = ipaddress.ip_address(host)
+                suspicious_traits.append({
+                    "type": "ip_address",
+                    "value": host,
+                    "description": "IP address used instead of domain name"
+                })
+                
+                # Check if IP is private
+                if ip.is_private:
                     suspicious_traits.append({
                         "type": "private_ip",
-                        "value": ip,
+                        "value": host,
                         "description": "Private IP address used"
                     })
             except ValueError:
                 pass
         
         # Check for too many subdomains
-        subdomain_parts = extracted.subdomain.split('.')
-        if len(subdomain_parts) > 3:
+        subdomain = extracted.subdomain
+        subdomain_count = subdomain.count('.') + 1 if subdomain else 0
+        if subdomain_count > 3:
             suspicious_traits.append({
                 "type": "many_subdomains",
-                "value": extracted.subdomain,
-                "description": f"Excessive number of subdomains ({len(subdomain_parts)})"
+                "value": subdomain,
+                "description": f"Excessive number of subdomains ({subdomain_count})"
             })
         
         # Check for suspicious TLD
@@ -141,16 +193,18 @@ class URLParser:
                 "description": f"Suspicious TLD '{extracted.suffix}'"
             })
         
-        # Check for hexadecimal/URL encoding in domain or path
-        if self.hex_pattern.search(netloc) or self.hex_pattern.search(parsed.path):
+        # Check for hexadecimal/URL encoding in domain or path, only running
+        # the regex on URLs containing a percent sign at all. A non-empty path
+        # starts with "/", so one search over both cannot match across them.
+        if "%" in url and _HEX_RE.search(netloc + parsed.path):
             suspicious_traits.append({
                 "type": "hex_encoding",
                 "value": url,
                 "description": "Hexadecimal encoding detected in URL"
             })
         
-        # Check for unicode/punycode obfuscation
-        if "xn--" in netloc:
+        # Check for unicode/punycode obfuscation, whatever the ACE prefix case
+        if "xn--" in netloc_lower:
             suspicious_traits.append({
                 "type": "punycode",
                 "value": netloc,
@@ -158,7 +212,7 @@ class URLParser:
             })
         
         # Check for excessive URL length
-        url_length = len(parsed.geturl())
+        url_length = len(url)
         if url_length > 100:
             suspicious_traits.append({
                 "type": "long_url",
@@ -167,7 +221,10 @@ class URLParser:
             })
         
         # Check for excessive number of special characters in domain
-        special_chars = sum(1 for c in netloc if not c.isalnum() and c not in ['.', '-', ':'])
+        if netloc.isascii():
+            special_chars = len(netloc.translate(_DOMAIN_CHARS_TABLE))
+        else:
+            special_chars = sum(1 for c in netloc if not c.isalnum() and c not in ".-:")
         if special_chars > 3:
             suspicious_traits.append({
                 "type": "special_chars",
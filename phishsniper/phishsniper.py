@@ -2,11 +2,12 @@
 Main PhishSniper class that orchestrates the URL analysis process.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple, Union
 
 from .modules.url_parser import URLParser
-from .modules.domain_intelligence import DomainIntelligence
+from .modules.domain_intelligence import DomainIntelligence, MAX_CONCURRENT_LOOKUPS
 from .modules.brand_matcher import BrandMatcher
 from .modules.risk_engine import RiskEngine
 from .result import AnalysisResult
@@ -30,8 +31,8 @@ class PhishSniper:
         
         # Initialize modules
         self.url_parser = URLParser()
-        self.domain_intelligence = DomainIntelligence()
-        self.brand_matcher = BrandMatcher()
+        self.domain_intelligence = DomainIntelligence(cache_file=self.config.get("whois_cache_file"))
+        self.brand_matcher = BrandMatcher(self.config.get("brands_file"))
         self.risk_engine = RiskEngine()
         
         logger.debug("PhishSniper initialized")
@@ -49,31 +50,133 @@ class PhishSniper:
         """
         logger.info(f"Analyzing URL: {url}")
         
-        # Parse URL and extract components
-        url_features = self.url_parser.parse(url)
+        # Parse URL and extract components, decoding the query only for verbose output
+        url_features = self.url_parser.parse(url, include_query_params=verbose)
         
         # Get domain intelligence
-        domain_info = self.domain_intelligence.analyze(url_features["hostname"])
+        domain_info = self.domain_intelligence.analyze(url_features["host"])
         
         # Check for brand spoofing
-        brand_matches = self.brand_matcher.find_matches(url_features["hostname"])
+        brand_matches = self.brand_matcher.find_matches(url_features["host"])
         
-        # Combine all features
-        all_features = {
-            **url_features,
-            "domain_info": domain_info,
-            "brand_matches": brand_matches
-        }
+        return self._build_result(url, url_features, domain_info, brand_matches, verbose)
+
+    async def analyze_async(self, url: str, verbose: bool = False) -> AnalysisResult:
+        """
+        Analyze a URL for phishing indicators without blocking on WHOIS.
+
+        Only the WHOIS lookup is awaited; parsing, brand matching and risk
+        scoring run synchronously inside the coroutine.
+
+        Args:
+            url (str): The URL to analyze
+            verbose (bool, optional): Whether to include detailed analysis. Defaults to False.
+
+        Returns:
+            AnalysisResult: Analysis result with risk score and details
+        """
+        logger.info(f"Analyzing URL: {url}")
         
+        # Parse URL and extract components, decoding the query only for verbose output
+        url_features = self.url_parser.parse(url, include_query_params=verbose)
+        
+        # Get domain intelligence
+        domain_info = await self.domain_intelligence.analyze_async(url_features["host"])
+        
+        # Check for brand spoofing
+        brand_matches = self.brand_matcher.find_matches(url_features["host"])
+        
+        return self._build_result(url, url_features, domain_info, brand_matches, verbose)
+
+    async def analyze_many_async(self, urls: List[str], verbose: bool = False,
+                                 concurrency: int = MAX_CONCURRENT_LOOKUPS
+                                 ) -> List[Union[AnalysisResult, Exception]]:
+        """
+        Analyze URLs concurrently, keeping a bounded number of WHOIS lookups in flight.
+
+        Args:
+            urls (List[str]): The URLs to analyze
+            verbose (bool, optional): Whether to include detailed analysis. Defaults to False.
+            concurrency (int, optional): Maximum number of analyses in flight
+
+        Returns:
+            List[Union[AnalysisResult, Exception]]: Result, or the exception raised
+                                                    analyzing it, for each URL in input order
+        """
+        outcomes: List[Union[AnalysisResult, Exception]] = [None] * len(urls)
+        async for index, outcome in self.iter_analyze_async(urls, verbose, concurrency):
+            outcomes[index] = outcome
+        return outcomes
+
+    async def iter_analyze_async(self, urls: List[str], verbose: bool = False,
+                                 concurrency: int = MAX_CONCURRENT_LOOKUPS
+                                 ) -> AsyncIterator[Tuple[int, Union[AnalysisResult, Exception]]]:
+        """
+        Analyze URLs concurrently, yielding each outcome as soon as it completes.
+
+        Closing the iterator early cancels the analyses still outstanding.
+
+        Args:
+            urls (List[str]): The URLs to analyze
+            verbose (bool, optional): Whether to include detailed analysis. Defaults to False.
+            concurrency (int, optional): Maximum number of analyses in flight
+
+        Yields:
+            Tuple[int, Union[AnalysisResult, Exception]]: Index of the URL and its result,
+                                                          or the exception raised analyzing it
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def analyze_one(index: int, url: str) -> Tuple[int, Union[AnalysisResult, Exception]]:
+            async with semaphore:
+                try:
+                    return index, await self.analyze_async(url, verbose)
+                except Exception as e:
+                    return index, e
+                    
+        tasks = [asyncio.ensure_future(analyze_one(index, url)) for index, url in enumerate(urls)]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _build_result(self, url: str, url_features: Dict[str, Any], domain_info: Dict[str, Any],
+                      brand_matches: List[Dict[str, Any]], verbose: bool = False) -> AnalysisResult:
+        """
+        Score the collected features and build the analysis result.
+
+        Args:
+            url (str): The analyzed URL
+            url_features (Dict[str, Any]): URL parser features
+            domain_info (Dict[str, Any]): Domain intelligence information
+            brand_matches (List[Dict[str, Any]]): Brand matches
+            verbose (bool, optional): Whether to include detailed analysis. Defaults to False.
+
+        Returns:
+            AnalysisResult: Analysis result with risk score and details
+        """
         # Calculate risk score
-        risk_score, risk_factors = self.risk_engine.calculate_risk(all_features)
+        risk_score, risk_factors = self.risk_engine.calculate_risk(url_features, domain_info, brand_matches)
+        
+        # Combine all features, only needed for verbose output
+        all_features = None
+        if verbose:
+            all_features = {
+                **url_features,
+                "domain_info": domain_info,
+                "brand_matches": brand_matches
+            }
         
         # Create result object
         result = AnalysisResult(
             url=url,
             risk_score=risk_score,
             risk_factors=risk_factors,
-            features=all_features if verbose else None
+            features=all_features
         )
         
         logger.info(f"Analysis complete. Risk score: {risk_score}%")
@@ -2,11 +2,15 @@
 Result class for PhishSniper analysis.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 
+# Slotted dataclasses need Python 3.10+; older versions keep a __dict__
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class AnalysisResult:
     """
     Container for URL analysis results.
@@ -15,6 +19,19 @@ class AnalysisResult:
     risk_score: float
     risk_factors: List[Dict[str, Any]]
     features: Optional[Dict[str, Any]] = None
+    _risk_level: str = field(init=False, repr=False, compare=False)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Compute the risk level once, as the result is immutable."""
+        if self.risk_score < 30:
+            risk_level = "Low"
+        elif self.risk_score < 70:
+            risk_level = "Medium"
+        else:
+            risk_level = "High"
+            
+        object.__setattr__(self, "_risk_level", risk_level)
 
     @property
     def risk_level(self) -> str:
@@ -24,20 +41,21 @@ class AnalysisResult:
         Returns:
             str: Risk level (Low, Medium, High)
         """
-        if self.risk_score < 30:
-            return "Low"
-        elif self.risk_score < 70:
-            return "Medium"
-        else:
-            return "High"
+        return self._risk_level
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the result to a dictionary.
 
+        The dictionary is built on first use and shared between calls, so
+        callers must copy it before modifying it.
+
         Returns:
             Dict[str, Any]: Dictionary representation of the result
         """
+        if self._dict is not None:
+            return self._dict
+            
         result = {
             "url": self.url,
             "risk_score": self.risk_score,
@@ -48,4 +66,5 @@ class AnalysisResult:
         if self.features:
             result["features"] = self.features
             
-        return result 
\ No newline at end of file
+        object.__setattr__(self, "_dict", result)
+        return result
@@ -3,10 +3,12 @@ Web interface for PhishSniper using Flask.
 """
 
 import os
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterator, AsyncIterator, Tuple
 
-from flask import Flask, request, jsonify, render_template, abort
+import orjson
+from flask import Flask, Response, current_app, request, render_template, abort
 
 from .phishsniper import PhishSniper
 
@@ -17,12 +19,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize PhishSniper
-phish_sniper = PhishSniper()
+# Media type of streamed batch responses, one JSON object per line
+NDJSON_MIMETYPE = "application/x-ndjson"
 
 # Initialize Flask app
 app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), "templates"))
 
+# Initialize PhishSniper, shared read-only by all requests
+app.config["PHISH_SNIPER"] = PhishSniper()
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """
+    Serialize a payload to a JSON response with orjson.
+
+    Args:
+        payload (Any): JSON-serializable payload
+        status (int, optional): HTTP status code. Defaults to 200.
+
+    Returns:
+        Response: JSON response
+    """
+    body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return app.response_class(body, status=status, mimetype="application/json")
+
 
 @app.route("/")
 def index():
@@ -36,17 +56,17 @@ def analyze():
     data = request.json
     
     if not data or "url" not in data:
-        return jsonify({"error": "URL is required"}), 400
+        return _json_response({"error": "URL is required"}, 400)
         
     url = data["url"]
     verbose = data.get("verbose", False)
     
     try:
-        result = phish_sniper.analyze(url, verbose)
-        return jsonify(result.to_dict())
+        result = current_app.config["PHISH_SNIPER"].analyze(url, verbose)
+        return _json_response(result.to_dict())
     except Exception as e:
         logger.error(f"Error analyzing URL {url}: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 
 @app.route("/api/batch", methods=["POST"])
@@ -55,28 +75,88 @@ def batch_analyze():
     data = request.json
     
     if not data or "urls" not in data or not isinstance(data["urls"], list):
-        return jsonify({"error": "List of URLs is required"}), 400
+        return _json_response({"error": "List of URLs is required"}, 400)
         
     urls = data["urls"]
     verbose = data.get("verbose", False)
+    phish_sniper = current_app.config["PHISH_SNIPER"]
+    
+    # Clients asking for NDJSON get each result or error as soon as it completes
+    if request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(_stream_batch(phish_sniper, urls, verbose), mimetype=NDJSON_MIMETYPE)
     
     results = []
     errors = []
     
-    for url in urls:
-        try:
-            result = phish_sniper.analyze(url, verbose)
-            results.append(result.to_dict())
-        except Exception as e:
-            logger.error(f"Error analyzing URL {url}: {str(e)}")
-            errors.append({"url": url, "error": str(e)})
+    # Analyze concurrently on an event loop, outcomes come back in input order
+    outcomes = asyncio.run(phish_sniper.analyze_many_async(urls, verbose))
     
-    return jsonify({
+    for url, outcome in zip(urls, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error analyzing URL {url}: {str(outcome)}")
+            errors.append({"url": url, "error": str(outcome)})
+        else:
+            results.append(outcome.to_dict())
+    
+    return _json_response({
         "results": results,
         "errors": errors
     })
 
 
+def _stream_batch(phish_sniper: PhishSniper, urls: List[str], verbose: bool = False) -> Iterator[bytes]:
+    """
+    Analyze URLs concurrently, yielding NDJSON lines in completion order.
+
+    Args:
+        phish_sniper (PhishSniper): PhishSniper instance
+        urls (List[str]): URLs to analyze
+        verbose (bool, optional): Include detailed analysis. Defaults to False.
+
+    Yields:
+        bytes: A result, or an object with "url" and "error" keys, per line
+    """
+    loop = asyncio.new_event_loop()
+    outcomes = phish_sniper.iter_analyze_async(urls, verbose)
+    
+    try:
+        while True:
+            try:
+                index, outcome = loop.run_until_complete(outcomes.__anext__())
+            except StopAsyncIteration:
+                break
+                
+            if isinstance(outcome, Exception):
+                logger.error(f"Error analyzing URL {urls[index]}: {str(outcome)}")
+                payload = {"url": urls[index], "error": str(outcome)}
+            else:
+                payload = outcome.to_dict()
+                
+            yield orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    finally:
+        # Cancels outstanding analyses if the client went away mid-stream
+        loop.run_until_complete(_close_stream(outcomes))
+        loop.close()
+
+
+async def _close_stream(outcomes: AsyncIterator[Tuple[int, Any]]) -> None:
+    """
+    Close a batch stream and cancel every task left on its event loop.
+
+    Closing the stream cancels its analyses, but WHOIS lookups they shared
+    run as tasks of their own and are cancelled here.
+
+    Args:
+        outcomes (AsyncIterator[Tuple[int, Any]]): The batch stream
+    """
+    await outcomes.aclose()
+    
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
 def create_app(config: Dict[str, Any] = None) -> Flask:
     """
     Create and configure the Flask application.
@@ -90,10 +170,10 @@ def create_app(config: Dict[str, Any] = None) -> Flask:
     if config:
         app.config.update(config)
         
-        # Re-initialize PhishSniper with config if needed
+        # Re-initialize PhishSniper with config if needed, before any
+        # request is served
         if "phishsniper" in config:
-            global phish_sniper
-            phish_sniper = PhishSniper(config["phishsniper"])
+            app.config["PHISH_SNIPER"] = PhishSniper(config["phishsniper"])
     
     return app
 
@@ -35,11 +35,12 @@ setup(
         "python-whois>=0.8.0",
         "tldextract>=3.4.0",
         "validators>=0.20.0",
-        "fuzzywuzzy>=0.18.0",
-        "python-Levenshtein>=0.20.9",
+        "pyahocorasick>=2.0.0",
+        "rapidfuzz>=3.0.0",
         "idna>=3.4",
         "urllib3>=1.26.15",
         "colorama>=0.4.6",
+        "orjson>=3.9.0",
         "click>=8.1.3",
         "flask>=2.2.3",
     ],
@@ -23,10 +23,10 @@ except ImportError as e:
     print(f"Failed to import whois: {e}")
 
 try:
-    import fuzzywuzzy
-    print(f"fuzzywuzzy imported successfully")
+    import rapidfuzz
+    print(f"rapidfuzz imported successfully")
 except ImportError as e:
-    print(f"Failed to import fuzzywuzzy: {e}")
+    print(f"Failed to import rapidfuzz: {e}")
 
 try:
     import validators
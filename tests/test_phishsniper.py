@@ -2,8 +2,24 @@
 Unit tests for PhishSniper.
 """
 
+import io
+import os
+import json
+import types
+import asyncio
+import datetime
+import tempfile
 import unittest
-from phishsniper import PhishSniper
+import contextlib
+from unittest import mock
+
+import orjson
+
+from phishsniper import PhishSniper, cli, web
+from phishsniper.modules.url_parser import URLParser
+from phishsniper.modules.brand_matcher import BrandMatcher
+from phishsniper.modules import domain_intelligence, tld_extractor
+from phishsniper.modules.domain_intelligence import DomainIntelligence
 
 
 class TestPhishSniper(unittest.TestCase):
@@ -35,6 +51,19 @@ class TestPhishSniper(unittest.TestCase):
         risk_types = [factor["type"] for factor in result.risk_factors]
         self.assertIn("suspicious_tld", risk_types)
 
+    def test_url_traits_scored_before_whois_traits(self):
+        """Test that WHOIS traits cannot crowd URL traits out of the capped score."""
+        url_features = self.phish_sniper.url_parser.parse("http://g00gle.tk/login.php")
+        brand_matches = self.phish_sniper.brand_matcher.find_matches(url_features["hostname"])
+        domain_info = {"suspicious_traits": [
+            {"type": "non_existent_domain", "description": "Domain does not exist"},
+            {"type": "suspicious_registrar", "description": "Suspicious registrar"}
+        ]}
+        
+        _, risk_factors = self.phish_sniper.risk_engine.calculate_risk(url_features, domain_info, brand_matches)
+        
+        self.assertIn("suspicious_tld", [factor["type"] for factor in risk_factors])
+
     def test_analyze_ip_address_url(self):
         """Test analyzing a URL with IP address."""
         result = self.phish_sniper.analyze("http://192.168.1.1/login")
@@ -47,6 +76,21 @@ class TestPhishSniper(unittest.TestCase):
         self.assertIn("ip_address", risk_types)
         self.assertIn("private_ip", risk_types)
 
+    def test_modules_share_hostname_extraction(self):
+        """Test that all modules split a URL's hostname through one cache entry."""
+        tld_extractor.extract.cache_clear()
+        self.phish_sniper.analyze("http://WWW.Example-Shop.com:8080/login")
+        
+        self.assertEqual(tld_extractor.extract.cache_info().currsize, 1)
+
+    def test_out_of_range_ip_is_not_an_ip_address(self):
+        """Test that URL parsing and domain intelligence agree on invalid IPs."""
+        url_features = self.phish_sniper.url_parser.parse("http://999.1.1.1/")
+        
+        self.assertNotIn("ip_address", [trait["type"] for trait in url_features["suspicious_traits"]])
+        self.assertFalse(self.phish_sniper.domain_intelligence._is_ip_address("999.1.1.1"))
+        self.assertTrue(self.phish_sniper.domain_intelligence._is_ip_address("10.0.0.1"))
+
     def test_analyze_homoglyph_attack(self):
         """Test analyzing a URL with homoglyph attack."""
         result = self.phish_sniper.analyze("https://arnazon.com/login")
@@ -75,5 +119,268 @@ class TestPhishSniper(unittest.TestCase):
         self.assertIn("domain_info", result.features)
 
 
+class TestBrandMatcher(unittest.TestCase):
+    """Test cases for BrandMatcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.brand_matcher = BrandMatcher()
+
+    def test_homoglyph_substitutions_sharing_a_character(self):
+        """Test that every substitution of a character is tried."""
+        # 'm' -> 'rn' and 'm' -> 'nn' share the same original character
+        matches = self.brand_matcher.find_matches("arnazon.com")
+        homoglyphs = [m for m in matches if m["type"] == "homoglyph_attack"]
+        self.assertEqual([m["brand"] for m in homoglyphs], ["amazon"])
+        self.assertEqual(homoglyphs[0]["substitution"], "'m' to 'rn'")
+
+    def test_brand_in_domain_skips_fuzzy_checks(self):
+        """Test that a domain containing a brand is only reported as such."""
+        matches = self.brand_matcher.find_matches("paypal-secure.com")
+        self.assertEqual([(m["type"], m["brand"]) for m in matches], [("brand_in_domain", "paypal")])
+
+    def test_short_brand_in_domain_keeps_homoglyph_checks(self):
+        """Test that a chance short-brand hit does not hide a homoglyph match."""
+        matches = self.brand_matcher.find_matches("amaz0n-deals.com")
+        self.assertIn(("partial_homoglyph", "amazon"), [(m["type"], m["brand"]) for m in matches])
+
+
+class TestURLParser(unittest.TestCase):
+    """Test cases for URLParser."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.url_parser = URLParser()
+
+    def test_cached_parse_is_not_shared(self):
+        """Test that altering a parse result does not leak into the cache."""
+        url = "http://192.168.1.1:8080/login?user=a"
+        first = self.url_parser.parse(url)
+        first["suspicious_traits"].clear()
+        first["query_params"]["user"].append("b")
+        
+        second = self.url_parser.parse(url)
+        
+        self.assertTrue(second["suspicious_traits"])
+        self.assertEqual(second["query_params"], {"user": ["a"]})
+
+
+class TestWhoisCache(unittest.TestCase):
+    """Test cases for the persistent WHOIS cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        cache_file = os.path.join(self.tmp_dir.name, "whois.db")
+        self.domain_intelligence = DomainIntelligence(cache_file=cache_file)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmp_dir.cleanup()
+
+    def test_cached_entry_skips_lookup(self):
+        """Test that a cached WHOIS entry is used instead of a lookup."""
+        self.domain_intelligence.whois_cache.set("example.com", types.SimpleNamespace(
+            domain_name="EXAMPLE.COM",
+            registrar="Example Registrar",
+            creation_date=[datetime.datetime(2000, 1, 1)],
+            expiration_date=datetime.datetime(2030, 1, 1),
+            updated_date=None
+        ))
+        
+        result = self.domain_intelligence.analyze("www.example.com")
+        
+        self.assertTrue(result["domain_exists"])
+        self.assertEqual(result["registrar"], "Example Registrar")
+        self.assertEqual(result["creation_date"], datetime.datetime(2000, 1, 1))
+        self.assertEqual(result["suspicious_traits"], [])
+
+    def test_cache_key_ignores_hostname_case(self):
+        """Test that differently cased hostnames share one cache entry."""
+        self.domain_intelligence.whois_cache.set("example.com", types.SimpleNamespace(
+            domain_name="EXAMPLE.COM", registrar="Example Registrar",
+            creation_date=None, expiration_date=None, updated_date=None
+        ))
+        
+        result = self.domain_intelligence.analyze("WWW.EXAMPLE.COM")
+        
+        self.assertEqual(result["domain"], "example.com")
+        self.assertEqual(result["registrar"], "Example Registrar")
+
+    def test_expired_entry_is_ignored(self):
+        """Test that entries older than the TTL are not returned."""
+        cache = self.domain_intelligence.whois_cache
+        cache.set("example.com", types.SimpleNamespace(
+            domain_name="EXAMPLE.COM", registrar=None,
+            creation_date=None, expiration_date=None, updated_date=None
+        ))
+        cache.ttl = -1
+        
+        self.assertIsNone(cache.get("example.com"))
+
+
+class TestAsyncWhoisClient(unittest.TestCase):
+    """Test cases for the asynchronous WHOIS client."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.domain_intelligence = DomainIntelligence()
+
+    def test_concurrent_lookups_of_a_domain_are_shared(self):
+        """Test that lookups of a domain already in flight are not repeated."""
+        lookups = []
+        
+        async def whois_async(domain):
+            lookups.append(domain)
+            await asyncio.sleep(0.01)
+            raise OSError("unreachable")
+            
+        async def run():
+            with mock.patch.object(DomainIntelligence, "_whois_async", side_effect=whois_async):
+                return await asyncio.gather(*(
+                    self.domain_intelligence.analyze_async(hostname)
+                    for hostname in ("example.com", "www.example.com", "mail.example.com")
+                ))
+                
+        results = asyncio.run(run())
+        
+        self.assertEqual(lookups, ["example.com"])
+        self.assertTrue(all(result["suspicious_traits"] for result in results))
+
+    def test_query_string_rewrites(self):
+        """Test that queries are rewritten per server like NICClient does."""
+        cases = [
+            ("whois.denic.de", False, "-T dn,ace -C UTF-8 example.de"),
+            ("whois.dk-hostmaster.dk", False, " --show-handles example.de"),
+            ("whois.jprs.jp", False, "example.de/e"),
+            ("com.whois-servers.net", True, "=example.de"),
+            ("com.whois-servers.net", False, "example.de"),
+            ("whois.verisign-grs.com", True, "example.de"),
+        ]
+        for server, many_results, expected in cases:
+            with self.subTest(server=server, many_results=many_results):
+                self.assertEqual(
+                    domain_intelligence._whois_query_string(server, "example.de", many_results), expected
+                )
+
+    def _query(self, responses):
+        """Run a query against a local server answering with the given responses."""
+        queries = []
+        
+        async def handle(reader, writer):
+            queries.append(await reader.readline())
+            writer.write(responses[len(queries) - 1])
+            await writer.drain()
+            writer.close()
+            
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                with mock.patch.object(domain_intelligence, "WHOIS_PORT", port):
+                    return await self.domain_intelligence._whois_query_async("127.0.0.1", "example.com")
+                    
+        return asyncio.run(run()), queries
+
+    def test_referral_is_followed(self):
+        """Test that a registry referral is queried and appended."""
+        text, queries = self._query([
+            b"Domain Name: EXAMPLE.COM\nRegistrar WHOIS Server: 127.0.0.1\n",
+            b"Registrar: Example Registrar\n",
+        ])
+        
+        self.assertEqual(queries, [b"example.com\r\n", b"example.com\r\n"])
+        self.assertTrue(text.endswith("Registrar: Example Registrar\n"))
+
+    def test_many_results_reply_is_retried(self):
+        """Test that a server asking for "=xxx" queries is queried again."""
+        text, queries = self._query([
+            b'To single out one record, look it up with "=xxx"\n',
+            b"Domain Name: EXAMPLE.COM\n",
+        ])
+        
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(text, "Domain Name: EXAMPLE.COM\n")
+
+
+class TestWebBatch(unittest.TestCase):
+    """Test cases for the batch API endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = web.app.test_client()
+
+    def test_ndjson_stream_has_one_line_per_url(self):
+        """Test that NDJSON clients get one result or error line per URL."""
+        urls = ["https://www.google.com", "http://g00gle.tk/login.php", None]
+        response = self.client.post(
+            "/api/batch", json={"urls": urls}, headers={"Accept": "application/x-ndjson"}
+        )
+        
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [orjson.loads(line) for line in response.get_data().splitlines()]
+        self.assertEqual(len(lines), len(urls))
+        self.assertCountEqual([line["url"] for line in lines], urls)
+        
+        errors = [line for line in lines if "error" in line]
+        self.assertEqual([error["url"] for error in errors], [None])
+
+    def test_json_response_by_default(self):
+        """Test that other clients get the ordered results document."""
+        response = self.client.post("/api/batch", json={"urls": ["https://www.google.com", None]})
+        
+        self.assertEqual(response.mimetype, "application/json")
+        body = response.get_json()
+        self.assertEqual([result["url"] for result in body["results"]], ["https://www.google.com"])
+        self.assertEqual([error["url"] for error in body["errors"]], [None])
+
+
+class TestCLIOutput(unittest.TestCase):
+    """Test cases for the CLI output file formats."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmp_dir.name, "results.json")
+        self.urls_file = os.path.join(self.tmp_dir.name, "urls.txt")
+        self.urls = ["https://www.google.com", "http://g00gle.tk/login.php"]
+        with open(self.urls_file, "w") as f:
+            f.write("\n".join(self.urls))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.tmp_dir.cleanup()
+
+    def _run(self, *args):
+        """Run the CLI with its console output captured."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cli.main(["--no-cache", "-o", self.output_file, *args])
+
+    def test_output_is_json_lines(self):
+        """Test that results are written as one JSON object per line."""
+        self.assertEqual(self._run("-f", self.urls_file, "-w", "1"), 0)
+        
+        with open(self.output_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line)["url"] for line in lines], self.urls)
+
+    def test_single_url_output_is_json_lines(self):
+        """Test that a single URL result is written as one JSON line."""
+        self.assertEqual(self._run("-u", self.urls[0]), 0)
+        
+        with open(self.output_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["url"], self.urls[0])
+
+    def test_pretty_output_is_json_array(self):
+        """Test that --pretty writes a single indented JSON array."""
+        self.assertEqual(self._run("-f", self.urls_file, "-w", "1", "--pretty"), 0)
+        
+        with open(self.output_file) as f:
+            results = json.load(f)
+        self.assertEqual([result["url"] for result in results], self.urls)
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file